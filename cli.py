@@ -0,0 +1,200 @@
+import argparse
+import csv
+import itertools
+import json
+import multiprocessing
+import sys
+import time
+
+import numpy as np
+from snapshot import NetworkSnapshot
+from utilities import read_rail_network_columns
+
+# Messages of the per-row error records, which match the ValueErrors raised by the quote method of RailNetwork
+UNKNOWN_START = "The CRS code provided for the starting station does not match the CRS code of any station within " \
+                "the network"
+UNKNOWN_DEST = "The CRS code provided for the destination station does not match the CRS code of any station " \
+               "within the network"
+NO_HUB = "The given station has no hub stations in its region."
+BAD_QUERY = "The query should have a start and a dest CRS code."
+
+_worker_snapshot = None  # The snapshot each worker process prices its batches with
+
+
+def read_queries(lines, input_format):
+    """
+    Function that takes the lines of a query file and its format ("jsonl" or "csv") and generates a (line, start,
+    dest) tuple for each query, where line is the line number of the query in the file. Queries that cannot be read
+    have None as their start and dest.
+
+    JSONL queries are objects with "start" and "dest" keys, one per line. CSV queries are rows with "start" and
+    "dest" columns, under a header naming the columns.
+    """
+    if input_format == "csv":
+        rows = csv.reader(lines)
+        header_info = next(rows, [])
+        if "start" not in header_info or "dest" not in header_info:
+            raise ValueError("The CSV query file should have a header with start and dest columns.")
+        start_column = header_info.index("start")
+        dest_column = header_info.index("dest")
+        for line, row in enumerate(rows, start=2):
+            if len(row) == len(header_info):
+                yield line, row[start_column], row[dest_column]
+            else:
+                yield line, None, None
+    else:
+        for line, text in enumerate(lines, start=1):
+            if not text.strip():  # Blank lines are not queries
+                continue
+            try:
+                query = json.loads(text)
+                start, dest = query["start"], query["dest"]
+            except (ValueError, TypeError, KeyError):
+                yield line, None, None
+                continue
+            if type(start) is str and type(dest) is str:
+                yield line, start, dest
+            else:
+                yield line, None, None
+
+
+def quote_batch(arrays, batch):
+    """
+    Function that takes network arrays and a list of (line, start, dest) queries, prices every query at once and
+    returns a list of JSON records, one per query holding its fare price or an error message if it could not be
+    priced, alongside the number of error records.
+    """
+    readable = [query for query in batch if query[1] is not None]
+    starts = arrays.index_of([start for line, start, dest in readable])
+    dests = arrays.index_of([dest for line, start, dest in readable])
+    known = (starts >= 0) & (dests >= 0)
+    fares = np.full(len(readable), np.nan)
+    if known.any():  # Only the queries between stations of the network can be planned
+        fares[known] = arrays.fares(starts[known], dests[known])
+    results = iter(zip(starts.tolist(), dests.tolist(), fares.tolist()))
+    records = []
+    n_errors = 0
+    for line, start, dest in batch:
+        if start is None:
+            records.append(json.dumps({"line": line, "error": BAD_QUERY}))
+            n_errors += 1
+            continue
+        start_index, dest_index, fare = next(results)
+        if start_index < 0:
+            error = UNKNOWN_START
+        elif dest_index < 0:
+            error = UNKNOWN_DEST
+        elif fare != fare:  # Only NaN is not equal to itself, marking a journey that cannot be planned
+            error = NO_HUB
+        else:
+            records.append(json.dumps({"line": line, "start": start, "dest": dest, "fare": fare}))
+            continue
+        records.append(json.dumps({"line": line, "start": start, "dest": dest, "error": error}))
+        n_errors += 1
+    return records, n_errors
+
+
+def _attach_worker(name):
+    """
+    Function run when each worker process starts, which attaches it to the snapshot of the given name.
+    """
+    global _worker_snapshot
+    _worker_snapshot = NetworkSnapshot.attach(name)
+
+
+def _quote_worker_batch(batch):
+    """
+    Function run by the worker processes to price a batch of queries with the snapshot they are attached to.
+    """
+    return quote_batch(_worker_snapshot.arrays, batch)
+
+
+def quote(args):
+    """
+    Function that runs the quote command with the parsed command-line arguments, streaming a JSON record for each
+    query to stdout and reporting the throughput to stderr.
+    """
+    started = time.perf_counter()
+    if args.snapshot is not None:  # Attaches to a network another process has already published
+        snapshot = NetworkSnapshot.attach(args.snapshot)
+    else:
+        rail_network, errors = read_rail_network_columns(args.network)
+        if errors:
+            for line, message in errors:
+                print("{}:{}: {}".format(args.network, line, message), file=sys.stderr)
+            return 1
+        # Workers attach to a snapshot of the network rather than each loading the file again
+        snapshot = NetworkSnapshot.publish(rail_network) if args.workers > 1 else None
+        arrays = rail_network.network_arrays()
+    input_format = args.format
+    if input_format is None:  # Guesses the format from the file extension, reading JSONL from stdin
+        input_format = "csv" if args.input.lower().endswith(".csv") else "jsonl"
+    input_file = None
+    n_queries = 0
+    n_errors = 0
+    try:
+        input_file = sys.stdin if args.input == "-" else open(args.input, "r", newline="")
+        queries = read_queries(input_file, input_format)
+        # Splits the queries into batches of the given size without reading the whole file first
+        batches = iter(lambda: list(itertools.islice(queries, args.batch_size)), [])
+        if args.workers > 1:
+            pool = multiprocessing.Pool(args.workers, initializer=_attach_worker, initargs=(snapshot.name,))
+            results = pool.imap(_quote_worker_batch, batches)  # imap keeps the batches in order
+        else:
+            pool = None
+            if args.snapshot is not None:
+                arrays = snapshot.arrays
+            results = (quote_batch(arrays, batch) for batch in batches)
+        try:
+            for records, batch_errors in results:
+                n_queries += len(records)
+                n_errors += batch_errors
+                sys.stdout.write("\n".join(records) + "\n")
+        finally:
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+    finally:
+        if input_file is not None and input_file is not sys.stdin:
+            input_file.close()
+        if snapshot is not None:
+            arrays = None  # Drops the arrays pointing into the snapshot so that it can be closed
+            snapshot.close()
+            if snapshot.owner:
+                snapshot.unlink()
+    elapsed = time.perf_counter() - started
+    print("Priced {} queries ({} errors) in {:.2f} s ({:.0f} queries/s)".format(
+        n_queries, n_errors, elapsed, n_queries / elapsed if elapsed else 0), file=sys.stderr)
+    return 0
+
+
+def main(argv=None):
+    """
+    Function that parses the command-line arguments and runs the chosen command, returning its exit code.
+
+    Usage: python -m railway quote (--network FILE | --snapshot NAME) [--input FILE] [--format {jsonl,csv}]
+    [--batch-size N] [--workers N]
+    """
+    parser = argparse.ArgumentParser(prog="python -m railway", description="Rail fare price tools.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    quote_parser = commands.add_parser("quote", help="Price a file of start/dest queries.")
+    network = quote_parser.add_mutually_exclusive_group(required=True)
+    network.add_argument("--network", help="Station file to load the network from (e.g. uk_stations.csv).")
+    network.add_argument("--snapshot", help="Name of a published NetworkSnapshot to attach to.")
+    quote_parser.add_argument("--input", default="-", help="Query file to read, or - for stdin (default).")
+    quote_parser.add_argument("--format", choices=["jsonl", "csv"],
+                              help="Format of the queries (default: csv for .csv files, otherwise jsonl).")
+    quote_parser.add_argument("--batch-size", type=int, default=10000, help="Queries priced at once (default 10000).")
+    quote_parser.add_argument("--workers", type=int, default=1, help="Worker processes to use (default 1).")
+    args = parser.parse_args(argv)
+    if args.batch_size < 1 or args.workers < 1:
+        parser.error("--batch-size and --workers should both be at least 1.")
+    try:
+        return quote(args)
+    except (OSError, ValueError) as error:  # Files that cannot be opened or read are reported without a traceback
+        print("error: {}".format(error), file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,7 +2,7 @@ import matplotlib.pyplot as plt
 import numpy as np
 
 
-def fare_price(distance, different_regions, hubs_in_dest_region):
+def fare_price(distance, different_regions, hubs_in_dest_region, base=1, decay=100, hub_factor=10):
     """
     A function to compute the fare price using the
     - distance - Between 2 stations in km -> Float
@@ -10,11 +10,37 @@ def fare_price(distance, different_regions, hubs_in_dest_region):
     - hubs_in_dest_region - Number of hub stations in the same region as the destination station -> Integer
     parameters with the formula given to calculate fare prices in GBP of direct travel between 2 connected stations and
     return the result
+
+    Optionally takes the tariff constants of the formula as parameters:
+    - base - The flat charge added to every leg in GBP. This is by default 1.
+    - decay - The distance in km over which the distance charge decays. This is by default 100.
+    - hub_factor - The divisor applied to the hub count of the destination region. This is by default 10.
+
+    Every parameter can be a numpy array, in which case the fare prices are computed element-wise using numpy
+    broadcasting.
     """
-    fareprice = 1 + distance * np.exp((-1 * distance) / 100) * (1 + (different_regions * hubs_in_dest_region) / 10)
+    fareprice = base + distance * np.exp((-1 * distance) / decay) * (1 + (different_regions * hubs_in_dest_region)
+                                                                     / hub_factor)
     return fareprice
 
 
+def haversine_distance(lat1, lon1, lat2, lon2):
+    """
+    A function to compute the distance (in km) between the points given by the
+    - lat1, lon1 - Latitude and longitude of the first point in degrees -> Float
+    - lat2, lon2 - Latitude and longitude of the second point in degrees -> Float
+    parameters using the Haversine formula, in the same way as the distance_to method of the Station class.
+
+    Every parameter can be a numpy array, in which case the distances are computed element-wise.
+    """
+    r = 6371  # Approximate radius of the Earth in km
+    distance = 2 * r * np.arcsin(np.sqrt(
+        (np.power((np.sin(np.radians((lat2 - lat1) / 2))), 2)) + (
+                np.cos(np.radians(lat1)) * np.cos(np.radians(lat2)) * np.power(
+            (np.sin(np.radians((lon2 - lon1) / 2))), 2))))
+    return distance
+
+
 class Station:
     """
     A class to represent a station.
@@ -56,6 +82,21 @@ class Station:
         if type(hub) != bool:  # Checks whether the hub attribute is of a type other than a boolean.
             raise TypeError("Whether the Station is a Hub Station should either be Boolean True or False.")
 
+    @classmethod
+    def from_checked(cls, name, region, crs, lat, lon, hub):
+        """
+        Method that creates a station object from attributes that have already been checked (for example by the
+        from_columns method of the RailNetwork class) without checking them again.
+        """
+        station = cls.__new__(cls)
+        station.name = name
+        station.region = region
+        station.crs = crs
+        station.lat = lat
+        station.lon = lon
+        station.hub = hub
+        return station
+
     def __repr__(self):
         """
         Method that returns a string when the station objects created from this class are displayed by name.
@@ -92,6 +133,344 @@ class Station:
         return distance
 
 
+class NetworkArrays:
+    """
+    A class to represent the stations of a rail network as numpy arrays (one array per station attribute) so that
+    journeys can be planned and priced for many pairs of stations at once.
+
+    Stations are referred to by their index, which is their position in the list of stations the arrays were built
+    from.
+    """
+
+    def __init__(self, crs, names, region_names, region_codes, lat, lon, hub, hubs_per_region, closest_hub,
+                 crs_sorted, crs_order):
+        """
+        Constructor method that defines all the necessary attributes for network array objects created from this
+        class. The arrays are used as given (they are not copied), use the build method to create them from station
+        columns.
+
+        Sets up the attributes:
+        - crs - The CRS code of each station. -> numpy array of strings
+        - names - The name of each station. -> numpy array of strings
+        - region_names - The sorted unique regions of the network. -> numpy array of strings
+        - region_codes - The index in region_names of the region of each station. -> numpy array of integers
+        - lat - The latitude of each station. -> numpy array of floats
+        - lon - The longitude of each station. -> numpy array of floats
+        - hub - Whether each station is a hub station or not. -> numpy array of booleans
+        - hubs_per_region - The number of hub stations in each region. -> numpy array of integers
+        - closest_hub - The index of the closest hub station in the same region as each station (excluding the
+        station itself), or -1 if there is none. -> numpy array of integers
+        - crs_sorted - The CRS codes sorted alphabetically, used to look up stations. -> numpy array of strings
+        - crs_order - The station index of each CRS code in crs_sorted. -> numpy array of integers
+        """
+        self.crs = crs
+        self.names = names
+        self.region_names = region_names
+        self.region_codes = region_codes
+        self.lat = lat
+        self.lon = lon
+        self.hub = hub
+        self.hubs_per_region = hubs_per_region
+        self.closest_hub = closest_hub
+        self.crs_sorted = crs_sorted
+        self.crs_order = crs_order
+
+    @classmethod
+    def build(cls, crs, names, regions, lat, lon, hub):
+        """
+        Method that takes the
+        - crs - The CRS code of each station -> list or numpy array of strings
+        - names - The name of each station -> list or numpy array of strings
+        - regions - The region of each station -> list or numpy array of strings
+        - lat - The latitude of each station -> list or numpy array of floats
+        - lon - The longitude of each station -> list or numpy array of floats
+        - hub - Whether each station is a hub station -> list or numpy array of booleans
+        columns of a rail network (in station order) and returns a network arrays object with the region and hub
+        indexes needed for journey planning computed from them.
+        """
+        crs = np.asarray(crs, dtype=str)
+        names = np.asarray(names, dtype=str)
+        region_names, region_codes = np.unique(np.asarray(regions, dtype=str), return_inverse=True)
+        region_codes = region_codes.astype(np.int64)
+        lat = np.asarray(lat, dtype=np.float64)
+        lon = np.asarray(lon, dtype=np.float64)
+        hub = np.asarray(hub, dtype=bool)
+        # Counts the hub stations in each region by counting the region codes of the hub stations
+        hubs_per_region = np.bincount(region_codes[hub], minlength=len(region_names)).astype(np.int64)
+        closest_hub = np.full(len(crs), -1, dtype=np.int64)
+        for code in range(len(region_names)):  # Goes through each region in the network
+            regional = np.flatnonzero(region_codes == code)  # Indexes of the stations in the region
+            regional_hubs = regional[hub[regional]]  # Indexes of the hub stations in the region
+            if len(regional_hubs) == 0:  # Stations in a region without hub stations have no closest hub
+                continue
+            for chunk in np.array_split(regional, max(1, len(regional) * len(regional_hubs) // 2 ** 20)):
+                # Works through the region in chunks so that the table of distances stays small
+                # Measures the distance from every hub station in the region to every station in the chunk in the
+                # same direction as the closest_hub method of the RailNetwork class does
+                distances = haversine_distance(lat[regional_hubs][None, :], lon[regional_hubs][None, :],
+                                               lat[chunk][:, None], lon[chunk][:, None])
+                distances[chunk[:, None] == regional_hubs[None, :]] = np.inf  # A station cannot be its own closest hub
+                nearest = np.argmin(distances, axis=1)  # argmin picks the first of equally close hubs, as min does
+                found = np.isfinite(distances[np.arange(len(chunk)), nearest])
+                closest_hub[chunk[found]] = regional_hubs[nearest[found]]
+        crs_order = np.argsort(crs, kind="stable").astype(np.int64)
+        return cls(crs, names, region_names, region_codes, lat, lon, hub, hubs_per_region, closest_hub,
+                   crs[crs_order], crs_order)
+
+    @classmethod
+    def from_stations(cls, list_of_stations):
+        """
+        Method that takes a list of station objects and returns a network arrays object built from their attributes.
+        """
+        return cls.build([station.crs for station in list_of_stations],
+                         [station.name for station in list_of_stations],
+                         [station.region for station in list_of_stations],
+                         [station.lat for station in list_of_stations],
+                         [station.lon for station in list_of_stations],
+                         [station.hub for station in list_of_stations])
+
+    def n_stations(self):
+        """
+        Method that returns the number of stations in the network arrays object.
+        """
+        return len(self.crs)
+
+    def index_of(self, crs_codes):
+        """
+        Method that takes one or more CRS codes and returns the index of the station each of them belongs to, or -1
+        for CRS codes that do not match any station in the network.
+        """
+        crs_codes = np.asarray(crs_codes, dtype=str)
+        if len(self.crs_sorted) == 0:  # No CRS code can match a station in an empty network
+            return np.full(crs_codes.shape, -1, dtype=np.int64)
+        # Finds where each CRS code would sit in the sorted CRS codes and checks whether the code found there matches
+        positions = np.minimum(np.searchsorted(self.crs_sorted, crs_codes), len(self.crs_sorted) - 1)
+        found = self.crs_sorted[positions] == crs_codes
+        return np.where(found, self.crs_order[positions], -1)
+
+    def routes(self, starts, dests):
+        """
+        Method that takes 2 arrays of station indexes,
+        - starts - The indexes of the starting stations -> numpy array of integers
+        - dests - The indexes of the destination stations -> numpy array of integers
+        and plans the journey between each pair of stations in the same way as the journey_planner method of the
+        RailNetwork class.
+
+        Returns an array with a row of 4 station indexes per journey, in order of travel and padded with -1 for
+        journeys of less than 3 legs, alongside an array that is False for journeys that cannot be planned because
+        one of the stations has no hub station in its region.
+        """
+        starts = np.asarray(starts, dtype=np.int64)
+        dests = np.asarray(dests, dtype=np.int64)
+        start_hub = self.hub[starts]
+        dest_hub = self.hub[dests]
+        hub_to_start = self.closest_hub[starts]
+        hub_to_dest = self.closest_hub[dests]
+        # A journey is direct if both stations are in the same region or are both hub stations
+        direct = (self.region_codes[starts] == self.region_codes[dests]) | (start_hub & dest_hub)
+        # Other journeys need a closest hub for both stations, as journey_planner looks both of them up
+        valid = direct | ((hub_to_start >= 0) & (hub_to_dest >= 0))
+        routes = np.full((len(starts), 4), -1, dtype=np.int64)
+        routes[:, 0] = starts
+        routes[direct, 1] = dests[direct]
+        both = ~direct & ~start_hub & ~dest_hub  # Neither station is a hub station -> 3 legs
+        routes[both, 1] = hub_to_start[both]
+        routes[both, 2] = hub_to_dest[both]
+        routes[both, 3] = dests[both]
+        only_start = ~direct & start_hub  # Only the starting station is a hub station -> 2 legs via the dest's hub
+        routes[only_start, 1] = hub_to_dest[only_start]
+        routes[only_start, 2] = dests[only_start]
+        only_dest = ~direct & dest_hub  # Only the destination station is a hub station -> 2 legs via the start's hub
+        routes[only_dest, 1] = hub_to_start[only_dest]
+        routes[only_dest, 2] = dests[only_dest]
+        routes[~valid, 1:] = -1
+        return routes, valid
+
+    def legs(self, routes):
+        """
+        Method that takes an array of routes as returned by the routes method and returns the fare_price inputs of
+        each leg of each journey as 3 arrays with a column per leg,
+        - distance - The distance of the leg in km
+        - different_regions - Whether the stations of the leg are in different regions (either 1 or 0)
+        - hubs_in_dest_region - Number of hub stations in the same region as the destination station of the leg
+        alongside an array that is True for the legs that are part of the journey.
+        """
+        leg_start = routes[:, :-1]
+        leg_dest = routes[:, 1:]
+        mask = leg_dest >= 0  # Padding stations mark the legs that are not part of the journey
+        leg_start = np.where(mask, leg_start, 0)
+        leg_dest = np.where(mask, leg_dest, 0)
+        # Measures each leg from its starting to its destination station, as journey_fare does
+        distance = haversine_distance(self.lat[leg_start], self.lon[leg_start], self.lat[leg_dest],
+                                      self.lon[leg_dest])
+        dest_regions = self.region_codes[leg_dest]
+        different_regions = (self.region_codes[leg_start] != dest_regions).astype(np.int64)
+        hubs_in_dest_region = self.hubs_per_region[dest_regions]
+        return distance, different_regions, hubs_in_dest_region, mask
+
+    def fares(self, starts, dests):
+        """
+        Method that takes 2 arrays of station indexes,
+        - starts - The indexes of the starting stations -> numpy array of integers
+        - dests - The indexes of the destination stations -> numpy array of integers
+        and returns the fare price of the journey between each pair of stations, calculated in the same way as the
+        journey_fare method of the RailNetwork class. Journeys that cannot be planned have a fare of NaN.
+        """
+        routes, valid = self.routes(starts, dests)
+        distance, different_regions, hubs_in_dest_region, mask = self.legs(routes)
+        fares = np.zeros(len(routes))
+        for leg in range(mask.shape[1]):  # Adds up the legs in order of travel, as journey_fare does
+            leg_fares = fare_price(distance[:, leg], different_regions[:, leg], hubs_in_dest_region[:, leg])
+            fares += np.where(mask[:, leg], leg_fares, 0)
+        fares[~valid] = np.nan
+        return fares
+
+    def journey_blocks(self, block_size=64, origins=None):
+        """
+        Method that generates the journeys between every pair of different stations in the network in blocks of
+        starting stations, yielding the starting and destination station indexes of each block as 2 arrays.
+
+        Optionally takes:
+        - A block_size parameter which determines the number of starting stations in each block. This is by default
+        64.
+        - An origins parameter which restricts the starting stations to the given station indexes. This is by default
+        None meaning every station is a starting station.
+        """
+        n_stations = self.n_stations()
+        if origins is None:
+            origins = np.arange(n_stations)
+        origins = np.asarray(origins, dtype=np.int64)
+        every_station = np.arange(n_stations)
+        for first in range(0, len(origins), block_size):
+            block = origins[first:first + block_size]
+            starts = np.repeat(block, n_stations)
+            dests = np.tile(every_station, len(block))
+            keep = starts != dests  # Journeys from a station to itself are left out
+            yield starts[keep], dests[keep]
+
+    def region_fare_summary(self, block_size=64, bin_edges=None, origins=None):
+        """
+        Method that prices every journey between 2 different stations of the network in blocks of starting stations
+        and returns a region fare summary object of the fares between each pair of regions, without keeping the
+        fares of every journey at once. Journeys that cannot be planned are left out.
+
+        Optionally takes:
+        - A block_size parameter which determines the number of starting stations priced at once. This is by default
+        64.
+        - A bin_edges parameter which sets the edges of the fare histograms used to estimate percentiles. This is by
+        default None meaning 0.25 GBP wide bins from 0 to 500 GBP.
+        - An origins parameter which restricts the starting stations to the given station indexes, so that the
+        journeys can be split between processes and their summaries merged. This is by default None meaning every
+        station is a starting station.
+        """
+        if bin_edges is None:
+            bin_edges = np.linspace(0, 500, 2001)
+        summary = RegionFareSummary(self.region_names, bin_edges)
+        for starts, dests in self.journey_blocks(block_size, origins):
+            fares = self.fares(starts, dests)
+            planned = ~np.isnan(fares)
+            summary.add(self.region_codes[starts[planned]], self.region_codes[dests[planned]], fares[planned])
+        return summary
+
+
+class Journey:
+    """
+    A class to represent a planned and priced journey within a rail network, as returned by the quote method of the
+    RailNetwork class. The summary text of the journey is only created when it is asked for.
+    """
+
+    __slots__ = ("network", "route", "distances", "fares", "total")
+
+    def __init__(self, network, route, distances, fares, total):
+        """
+        Constructor method that defines all the necessary attributes for journey objects created from this class.
+
+        Sets up the attributes:
+        - network - The rail network object the journey was planned in. -> RailNetwork
+        - route - The indexes of the stations travelled to, in order of travel. -> Tuple of integers
+        - distances - The distance of each leg of the journey in km. -> Tuple of floats
+        - fares - The fare price of each leg of the journey in GBP. -> Tuple of floats
+        - total - The fare price of the whole journey in GBP. -> Float
+        """
+        self.network = network
+        self.route = route
+        self.distances = distances
+        self.fares = fares
+        self.total = total
+
+    def __repr__(self):
+        """
+        Method that returns a string when the journey objects created from this class are displayed by name.
+        """
+        return "Journey(" + " -> ".join(self.network.station_at(index).crs for index in self.route) + ", \u00a3" + \
+            str(round(self.total, 2)) + ")"
+
+    def stations(self):
+        """
+        Method that returns a list of the station objects travelled to in the journey, in order of travel.
+        """
+        return [self.network.station_at(index) for index in self.route]
+
+    def summary(self):
+        """
+        Method that returns the summary of the journey and its fare price printed by the journey_fare method of the
+        RailNetwork class.
+        """
+        stations = self.stations()
+        # The stations between the first and the last are followed by their name in brackets
+        route = [stations[0].crs] + [station.crs + " (" + station.name + ")" for station in stations[1:-1]] + \
+            [stations[-1].crs]
+        # \u00a3 is the pound sign in unicode
+        return "Journey from {0} ({1}) to {2} ({3})\nRoute: {4}\nFare: \u00a3{5}".format(
+            stations[0].name, stations[0].crs, stations[-1].name, stations[-1].crs, " -> ".join(route),
+            round(self.total, 2))
+
+
+def render_journeys(journeys):
+    """
+    Function that takes a list of journey objects and returns their summaries as a single report, with a blank line
+    after each summary as when they are printed by the journey_fare method of the RailNetwork class.
+    """
+    return "".join([journey.summary() + "\n\n" for journey in journeys])
+
+
+def _is_string_column(values):
+    """
+    Function that takes a column of values and returns it as a numpy array alongside an array that is True for the
+    values that are strings.
+    """
+    if isinstance(values, np.ndarray) and values.dtype.kind == "U":  # Every value of a unicode array is a string
+        return values, np.ones(values.shape, dtype=bool)
+    values = np.asarray(values, dtype=object)  # Keeps the type of each value rather than converting them to strings
+    return values, np.fromiter((type(value) is str for value in values), dtype=bool, count=len(values))
+
+
+def _float_column(values):
+    """
+    Function that takes a column of numbers (or strings of numbers) and returns it as a numpy array of floats with NaN
+    in place of the values that are not numbers, alongside an array that is True for the values that are numbers.
+    """
+    values = np.asarray(values)
+    if values.dtype.kind == "f":  # Arrays of floats need no conversion
+        return values.astype(np.float64), np.ones(values.shape, dtype=bool)
+    try:  # Converts the whole column at once, which only fails if one of the values is not a number
+        if values.dtype.kind in "bO":
+            raise TypeError  # Booleans and mixed values are checked one by one below
+        return values.astype(np.float64), np.ones(values.shape, dtype=bool)
+    except (TypeError, ValueError):
+        pass
+    converted = np.full(values.shape, np.nan)
+    is_number = np.zeros(values.shape, dtype=bool)
+    for row, value in enumerate(values.tolist()):  # Finds the values that are not numbers one by one
+        if type(value) in (float, int, str):
+            try:
+                converted[row] = float(value)
+                is_number[row] = True
+            except ValueError:
+                continue
+    return converted, is_number
+
+
 class RailNetwork:
     """
     A class to represent a rail network.
@@ -119,6 +498,99 @@ class RailNetwork:
         for station in list_of_stations:
             self.stations.update({station.crs: station})  # Updates the dictionary with a new key, value pair with the
             # station's CRS code being the key and the station itself being the value
+        self._network_arrays = None  # Network arrays are only built once they are first needed
+
+    @classmethod
+    def from_columns(cls, names, regions, crs, lat, lon, hub):
+        """
+        Method that takes the columns of a table of stations (one value per station in each column, in the same order)
+        - names - The name of each station -> list or numpy array of strings
+        - regions - The region of each station -> list or numpy array of strings
+        - crs - The CRS code of each station -> list or numpy array of strings
+        - lat - The latitude of each station -> list or numpy array of floats (or strings of numbers)
+        - lon - The longitude of each station -> list or numpy array of floats (or strings of numbers)
+        - hub - Whether each station is a hub station -> list or numpy array of booleans (or 0/1, "0"/"1")
+        and checks every row in the same way as the Station and RailNetwork classes do, but for whole columns at once.
+
+        Returns a tuple of the rail network object created from the columns and a list of errors. If any row fails a
+        check, the rail network object is None and the list holds every error found as a (row, message) tuple,
+        where row is the index of the row in the columns. Raises a ValueError if the columns have different lengths.
+        """
+        if len({len(names), len(regions), len(crs), len(lat), len(lon), len(hub)}) > 1:
+            raise ValueError("All the columns used to form a RailNetwork must have the same number of rows.")
+        errors = []
+        names, name_ok = _is_string_column(names)
+        regions, region_ok = _is_string_column(regions)
+        crs, crs_ok = _is_string_column(crs)
+        text_ok = name_ok & region_ok & crs_ok
+        for row in np.flatnonzero(~text_ok):
+            errors.append((row, "The Station's name, region and CRS code should all be strings."))
+        # Checks the CRS codes that are strings are 3 characters long and fully uppercase, as the Station class does
+        crs_text = np.where(crs_ok, crs, "").astype(str)
+        crs_format_ok = ~crs_ok | ((np.char.str_len(crs_text) == 3) & np.char.isupper(crs_text))
+        for row in np.flatnonzero(~crs_format_ok):
+            errors.append((row, "The Station's CRS code should be a 3-character string that only has UPPERCASE "
+                                "letters"))
+        lat, lat_ok = _float_column(lat)
+        lon, lon_ok = _float_column(lon)
+        for row in np.flatnonzero(~(lat_ok & lon_ok)):
+            errors.append((row, "The latitude and longitude of the Station should both be decimal numbers in degrees "
+                                "(should be a float value)."))
+        for row in np.flatnonzero(lat_ok & ~((lat >= -90.0) & (lat <= 90.0))):  # NaN fails these checks too
+            errors.append((row, "The latitude of the Station should be between -90.0 degrees and 90.0 degrees"))
+        for row in np.flatnonzero(lon_ok & ~((lon >= -180.0) & (lon <= 180.0))):
+            errors.append((row, "The longitude of the Station should be between -180.0 degrees and 180.0 degrees"))
+        hub = np.asarray(hub)
+        if hub.dtype.kind == "b":
+            hub_ok = np.ones(hub.shape, dtype=bool)
+        else:  # Accepts the hub flags used in station files (0 or 1) as well as booleans
+            hub_text = hub.astype(str)
+            hub_ok = np.isin(hub_text, ["0", "1", "False", "True"])
+            hub = np.isin(hub_text, ["1", "True"])
+        for row in np.flatnonzero(~hub_ok):
+            errors.append((row, "Whether the Station is a Hub Station should either be Boolean True or False."))
+        # Finds the rows whose CRS code has already been used by an earlier row
+        unique_crs, first_rows, inverse = np.unique(crs_text, return_index=True, return_inverse=True)
+        duplicated = crs_ok & (first_rows[inverse] != np.arange(len(crs_text)))
+        for row in np.flatnonzero(duplicated):
+            errors.append((row, "The CRS code {} is used for more than 1 station. All Stations used to form a "
+                                "RailNetwork must have unique CRS codes.".format(crs_text[row])))
+        if errors:
+            errors.sort(key=lambda error: error[0])  # Sorting is stable so errors of a row keep the order of checks
+            return None, [(int(row), message) for row, message in errors]
+        # Every row has passed the checks, so the station objects are created without checking them again
+        list_of_stations = [Station.from_checked(*row) for row in zip(names.tolist(), regions.tolist(),
+                                                                      crs_text.tolist(), lat.tolist(), lon.tolist(),
+                                                                      hub.tolist())]
+        rail_network = cls.__new__(cls)
+        rail_network.list_of_stations = list_of_stations
+        rail_network.stations = dict(zip(crs_text.tolist(), list_of_stations))
+        rail_network._network_arrays = None
+        return rail_network, []
+
+    def network_arrays(self):
+        """
+        Method that returns a network arrays object holding the stations of the rail network object as numpy arrays.
+        The arrays are built the first time this method is called and reused afterwards, so changes made to the
+        station objects after that are not reflected in them.
+        """
+        if self._network_arrays is None:
+            self._network_arrays = NetworkArrays.from_stations(self.list_of_stations)
+        return self._network_arrays
+
+    def region_fare_summary(self, block_size=64, bin_edges=None, origins=None):
+        """
+        Method that returns a region fare summary object of the fares of every journey between 2 different stations
+        of the rail network object, grouped by origin and destination region. See the region_fare_summary method of
+        the NetworkArrays class for the optional parameters.
+        """
+        return self.network_arrays().region_fare_summary(block_size, bin_edges, origins)
+
+    def station_at(self, index):
+        """
+        Method that returns the station object at the given index of the list of stations of the rail network object.
+        """
+        return self.list_of_stations[index]
 
     def regions(self):
         """
@@ -232,6 +704,34 @@ class RailNetwork:
                 elif not start_station.hub and dest_station.hub:
                     return [start_station, closest_hub_to_start, dest_station]
 
+    def quote(self, start, dest):
+        """
+        Method that takes 2 CRS codes as parameters,
+        - start - The CRS code of the starting station -> string
+        - dest - The CRS code of the destination station -> string
+        plans the journey between the two stations in the same way as the journey_planner method and returns a journey
+        object holding the route, the distance and fare price of each leg and the fare price of the whole journey.
+        """
+        arrays = self.network_arrays()
+        start_index, dest_index = arrays.index_of([start, dest]).tolist()
+        if start_index < 0:  # Checks whether the CRS code given in the start parameter matches a station
+            raise ValueError("The CRS code provided for the starting station does not match the CRS code of any "
+                             "station within the network")
+        if dest_index < 0:  # Checks whether the CRS code given in the dest parameter matches a station
+            raise ValueError("The CRS code provided for the destination station does not match the CRS code of any "
+                             "station within the network")
+        routes, valid = arrays.routes([start_index], [dest_index])
+        if not valid[0]:  # The journey needs the closest hub of a station that has no hub stations in its region
+            raise ValueError("The given station has no hub stations in its region.")
+        distance, different_regions, hubs_in_dest_region, mask = arrays.legs(routes)
+        n_legs = int(mask[0].sum())
+        leg_fares = fare_price(distance[0, :n_legs], different_regions[0, :n_legs], hubs_in_dest_region[0, :n_legs])
+        total = 0
+        for leg_fare in leg_fares:  # Adds up the legs in order of travel
+            total += leg_fare
+        return Journey(self, tuple(routes[0, :n_legs + 1].tolist()), tuple(distance[0, :n_legs].tolist()),
+                       tuple(leg_fares.tolist()), float(total))
+
     def journey_fare(self, start, dest, summary=False):
         """
         Method that takes 2 CRS codes as parameters,
@@ -242,58 +742,10 @@ class RailNetwork:
         Optionally takes summary as a parameter which prints a summary of the journey and its fare price if it is True.
         This is by default False.
         """
-        journey_route = self.journey_planner(start, dest)  # Puts the list of stations passed in the journey between
-        # the 2 given stations in the journey_route variable
-        fare = 0 # Sets up the fare variable which will store the fare price for the journey
-        # Creates the first line for the print that occurs if the summary parameter is True, numbers are replaced by
-        # the values by the format function in the order of inputs to the format function.
-        summary_line_one = "Journey from {0} ({1}) to {2} ({3})".format(journey_route[0].name, journey_route[0].crs,
-                                                                        journey_route[-1].name, journey_route[-1].crs)
-        # 3 checks of the length of the journey_route list which shows whether it is a 1,2 or 3 leg journey
-        if len(journey_route) == 2:
-            # Creates the second line for the print that occurs if the summary parameter is True for a 1 leg journey.
-            # numbers are replaced by the values by the format function in the order of inputs to the format function.
-            summary_line_two = summary_line_two = "Route: {0} -> {1}".format(journey_route[0].crs, journey_route[1].crs)
-        elif len(journey_route) == 3:
-            # Creates the second line for the print that occurs if the summary parameter is True for a 2 leg journey.
-            # numbers are replaced by the values by the format function in the order of inputs to the format function.
-            summary_line_two = summary_line_two = "Route: {0} -> {1} ({2}) -> {3}".format(journey_route[0].crs,
-                                                                                          journey_route[1].crs,
-                                                                                          journey_route[1].name,
-                                                                                          journey_route[2].crs)
-            # Creates the second line for the print that occurs if the summary parameter is True for a 3 leg journey.
-            # numbers are replaced by the values by the format function in the order of inputs to the format function.
-        elif len(journey_route) == 4:
-            summary_line_two = summary_line_two = "Route: {0} -> {1} ({2}) -> {3} ({4}) -> {5}".format(
-                journey_route[0].crs,
-                journey_route[1].crs,
-                journey_route[1].name,
-                journey_route[2].crs, journey_route[2].name, journey_route[3].crs)
-
-        # Goes through each leg of the journey as fare price needs to be calculated for each leg individually first
-        for index in range(len(journey_route) - 1):
-            start_station = journey_route[index]  # Sets the starting station for the calculation
-            if index == 0: # At this index the station is guaranteed to be the start station
-                summary_line_two.format(start_station.crs)  # Formats the start station's CRS code into the summary
-                # text.
-            dest_station = journey_route[index + 1]  # Sets the destination station for the calculation
-            # This would be 1 after the starting station as the stations returned by journey_route are in order of
-            # travel
-            if start_station.region != dest_station.region:  # Checks whether the regions of both stations are different
-                diff_regions = 1
-            else:
-                diff_regions = 0
-            distance = start_station.distance_to(dest_station)  # Calculates the distance from the starting
-            # station to the destination station for the fare price calculation using the distance_to method
-            regional_hubs_in_dest = len(self.hub_stations(dest_station.region))  # Gets a list of hub stations within
-            # the same region as the destination station using the hub_stations method and measures the length of
-            # this list
-            fare += fare_price(distance, diff_regions, regional_hubs_in_dest) # Calculates the fare price for this
-            # leg and adds it to the previous value of the fare price variable
+        journey = self.quote(start, dest)  # Plans and prices the journey between the 2 given stations
         if summary:  # Checks whether the summary parameter has been passed as True
-            # Prints the cost in an informative format - \u00a3 is the pound sign in unicode
-            print(summary_line_one + "\n" + summary_line_two + "\n" + "Fare: \u00a3{}".format(round(fare, 2)) + "\n")
-        return fare
+            print(journey.summary() + "\n")  # The summary text is only created when it is printed
+        return journey.total
 
     def plot_fares_to(self, crs_code, save=False, bins=10, colour="red", edge_colour="none", line_width=1, fill=True):
         """
@@ -413,3 +865,259 @@ class RailNetwork:
 
         plt.show()
         return
+
+
+class RegionFareSummary:
+    """
+    A class to represent a summary of the fare prices of journeys between every pair of regions (origin region and
+    destination region) of a rail network, built up from blocks of journeys without keeping the fares themselves.
+
+    Summaries of different sets of journeys (for example those priced by different processes) can be merged, as long
+    as they share the same regions and histogram bin edges.
+    """
+
+    def __init__(self, region_names, bin_edges):
+        """
+        Constructor method that defines all the necessary attributes for region fare summary objects created from
+        this class.
+
+        Sets up the attributes:
+        - region_names - The sorted unique regions of the network, whose indexes are used as region codes. -> numpy
+        array of strings
+        - bin_edges - The edges of the fare histogram bins in GBP. Fares outside the edges are counted in the first
+        or last bin. -> numpy array of floats
+        - counts - The number of journeys between each pair of regions. -> numpy array with a row per origin region
+        and a column per destination region
+        - sums, minimum, maximum - The total, smallest and largest fare between each pair of regions. -> numpy arrays
+        - histogram - The number of fares in each bin between each pair of regions. -> numpy array
+        """
+        self.region_names = np.asarray(region_names)
+        self.bin_edges = np.asarray(bin_edges, dtype=np.float64)
+        n_regions = len(self.region_names)
+        self.counts = np.zeros((n_regions, n_regions), dtype=np.int64)
+        self.sums = np.zeros((n_regions, n_regions))
+        self.minimum = np.full((n_regions, n_regions), np.inf)
+        self.maximum = np.full((n_regions, n_regions), -np.inf)
+        self.histogram = np.zeros((n_regions, n_regions, len(self.bin_edges) - 1), dtype=np.int64)
+
+    def add(self, origin_regions, dest_regions, fares):
+        """
+        Method that takes the origin region codes, destination region codes and fare prices of a block of journeys
+        (as 3 numpy arrays of the same length) and adds them to the summary.
+        """
+        n_regions = len(self.region_names)
+        n_bins = len(self.bin_edges) - 1
+        pairs = origin_regions * n_regions + dest_regions  # A single code for each pair of regions
+        self.counts += np.bincount(pairs, minlength=n_regions ** 2).reshape(n_regions, n_regions)
+        self.sums += np.bincount(pairs, weights=fares, minlength=n_regions ** 2).reshape(n_regions, n_regions)
+        np.minimum.at(self.minimum.reshape(-1), pairs, fares)
+        np.maximum.at(self.maximum.reshape(-1), pairs, fares)
+        bins = np.clip(np.searchsorted(self.bin_edges, fares, side="right") - 1, 0, n_bins - 1)
+        self.histogram += np.bincount(pairs * n_bins + bins, minlength=n_regions ** 2 * n_bins).reshape(
+            self.histogram.shape)
+
+    def merge(self, other):
+        """
+        Method that adds the journeys of another region fare summary object to this one and returns this one. Raises a
+        ValueError if the summaries do not share the same regions and histogram bin edges.
+        """
+        if not (np.array_equal(self.region_names, other.region_names) and
+                np.array_equal(self.bin_edges, other.bin_edges)):
+            raise ValueError("Only region fare summaries with the same regions and bin edges can be merged.")
+        self.counts += other.counts
+        self.sums += other.sums
+        np.minimum(self.minimum, other.minimum, out=self.minimum)
+        np.maximum(self.maximum, other.maximum, out=self.maximum)
+        self.histogram += other.histogram
+        return self
+
+    def mean(self):
+        """
+        Method that returns the mean fare between each pair of regions, or NaN for pairs without journeys.
+        """
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.counts > 0, self.sums / self.counts, np.nan)
+
+    def percentile(self, q):
+        """
+        Method that returns an estimate of the q-th percentile (between 0 and 100) of the fares between each pair of
+        regions, or NaN for pairs without journeys. The estimate interpolates within the histogram bin holding the
+        percentile and is kept between the smallest and largest fare.
+        """
+        cumulative = np.cumsum(self.histogram, axis=-1)
+        target = self.counts[..., None] * (q / 100)
+        # The first bin whose cumulative count reaches the target holds the percentile
+        bins = np.minimum(np.argmax(cumulative >= target, axis=-1), self.histogram.shape[-1] - 1)[..., None]
+        before = np.take_along_axis(cumulative, bins, axis=-1) - np.take_along_axis(self.histogram, bins, axis=-1)
+        in_bin = np.maximum(np.take_along_axis(self.histogram, bins, axis=-1), 1)
+        low = self.bin_edges[bins]
+        width = self.bin_edges[bins + 1] - low
+        estimate = (low + np.clip((target - before) / in_bin, 0, 1) * width)[..., 0]
+        estimate = np.clip(estimate, self.minimum, self.maximum)
+        return np.where(self.counts > 0, estimate, np.nan)
+
+    def results(self, percentiles=(5, 25, 50, 75, 95)):
+        """
+        Method that returns a dictionary with an (origin region, destination region) key for each pair of regions
+        with journeys, whose value is a dictionary of the "count", "min", "mean" and "max" of the fares between them
+        and a "p<q>" estimate for each percentile q in the optional percentiles parameter. This is by default
+        (5, 25, 50, 75, 95).
+        """
+        mean = self.mean()
+        estimates = {"p{}".format(q): self.percentile(q) for q in percentiles}
+        summary = {}
+        for origin, dest in zip(*np.nonzero(self.counts)):
+            pair = {"count": int(self.counts[origin, dest]), "min": float(self.minimum[origin, dest]),
+                    "mean": float(mean[origin, dest]), "max": float(self.maximum[origin, dest])}
+            for key, estimate in estimates.items():
+                pair[key] = float(estimate[origin, dest])
+            summary[(str(self.region_names[origin]), str(self.region_names[dest]))] = pair
+        return summary
+
+
+class FareModel:
+    """
+    A class to represent the fare_price formula with its tariff constants (base, decay and hub_factor) as parameters,
+    used to price every journey in a rail network under many sets of tariff constants at once.
+    """
+
+    def __init__(self, rail_network, max_memory=2 ** 28):
+        """
+        Constructor method that defines all the necessary attributes for fare model objects created from this class.
+
+        Sets up the attributes:
+        - rail_network - The rail network object whose journeys are priced. -> RailNetwork
+        - max_memory - The approximate number of bytes the fare tables of a single block of journeys may use. This
+        is by default 2 ** 28 (256 MiB). -> Integer
+        """
+        self.rail_network = rail_network
+        self.max_memory = max_memory
+
+    def block_size(self, n_scenarios):
+        """
+        Method that returns the number of starting stations priced together for the given number of scenarios, so
+        that the fare tables of each block (around 4 arrays of 8 byte floats with a row per scenario and a column per
+        journey) stay within the max_memory attribute. At least 1 starting station is always priced per block.
+        """
+        n_stations = max(self.rail_network.network_arrays().n_stations(), 1)
+        journeys_per_block = self.max_memory // (4 * 8 * max(n_scenarios, 1))
+        return max(1, journeys_per_block // n_stations)
+
+    def journey_fares(self, starts, dests, scenarios):
+        """
+        Method that takes 2 arrays of station indexes,
+        - starts - The indexes of the starting stations -> numpy array of integers
+        - dests - The indexes of the destination stations -> numpy array of integers
+        and an array of scenarios (see the evaluate method) and returns the fare prices of the journeys that can be
+        planned between the pairs of stations as an array with a row per scenario and a column per journey.
+        """
+        scenarios = self._check_scenarios(scenarios)
+        arrays = self.rail_network.network_arrays()
+        routes, valid = arrays.routes(starts, dests)
+        distance, different_regions, hubs_in_dest_region, mask = arrays.legs(routes[valid])
+        # Turns each tariff constant into a column so that it broadcasts against the legs of every journey
+        base, decay, hub_factor = (scenarios[:, column:column + 1] for column in range(3))
+        fares = np.zeros((len(scenarios), len(distance)))
+        for leg in range(mask.shape[1]):  # Adds up the legs in order of travel, as journey_fare does
+            priced = mask[:, leg]  # Only the journeys that have this leg are priced for it
+            if not priced.any():
+                continue
+            fares[:, priced] += fare_price(distance[priced, leg], different_regions[priced, leg],
+                                           hubs_in_dest_region[priced, leg], base, decay, hub_factor)
+        return fares
+
+    def evaluate(self, scenarios, bins=50):
+        """
+        Method that takes
+        - scenarios - Sets of tariff constants to price the journeys with, one (base, decay, hub_factor) row per
+        scenario -> list of tuples or numpy array with 3 columns
+        and prices every journey between 2 different stations of the rail network under each scenario, working
+        through the journeys in blocks of starting stations so that memory use is bounded by the max_memory attribute.
+        Journeys that cannot be planned (see the journey_planner method of the RailNetwork class) are left out.
+
+        Optionally takes a bins parameter which is either the number of equal-width bins spanning the fares of each
+        scenario, or a sequence of bin edges shared by every scenario. This is by default 50. Using a number of bins
+        needs a second pass over the journeys as the range of fares is only known after the first.
+
+        Returns a dictionary with:
+        - "scenarios" - The tariff constants of each scenario -> numpy array with 3 columns
+        - "journeys" - The number of journeys priced under each scenario -> Integer
+        - "unplanned" - The number of journeys that could not be planned -> Integer
+        - "revenue", "mean", "min", "max" - The total, mean, smallest and largest fare of each scenario -> numpy arrays
+        - "histogram" - The number of fares in each bin for each scenario -> numpy array with a row per scenario
+        - "bin_edges" - The bin edges of each scenario -> numpy array with a row per scenario
+        """
+        scenarios = self._check_scenarios(scenarios)
+        n_scenarios = len(scenarios)
+        arrays = self.rail_network.network_arrays()
+        block_size = self.block_size(n_scenarios)
+        journeys = 0
+        unplanned = 0
+        revenue = np.zeros(n_scenarios)
+        smallest = np.full(n_scenarios, np.inf)
+        largest = np.full(n_scenarios, -np.inf)
+        shared_edges = None if np.ndim(bins) == 0 else np.asarray(bins, dtype=np.float64)
+        if shared_edges is not None:
+            histogram = np.zeros((n_scenarios, len(shared_edges) - 1), dtype=np.int64)
+        for starts, dests in arrays.journey_blocks(block_size):
+            fares = self.journey_fares(starts, dests, scenarios)
+            journeys += fares.shape[1]
+            unplanned += len(starts) - fares.shape[1]
+            if fares.shape[1] == 0:
+                continue
+            revenue += fares.sum(axis=1)
+            smallest = np.minimum(smallest, fares.min(axis=1))
+            largest = np.maximum(largest, fares.max(axis=1))
+            if shared_edges is not None:
+                histogram += self._histogram(fares, shared_edges)
+        if shared_edges is None:  # Second pass, binning the fares of each scenario between its smallest and largest
+            bin_edges = np.linspace(smallest, largest, int(bins) + 1, axis=1)
+            histogram = np.zeros((n_scenarios, int(bins)), dtype=np.int64)
+            if journeys:
+                for starts, dests in arrays.journey_blocks(block_size):
+                    histogram += self._histogram(self.journey_fares(starts, dests, scenarios), bin_edges)
+        else:
+            bin_edges = np.tile(shared_edges, (n_scenarios, 1))
+        return {"scenarios": scenarios, "journeys": journeys, "unplanned": unplanned, "revenue": revenue,
+                "mean": revenue / journeys if journeys else np.full(n_scenarios, np.nan),
+                "min": smallest, "max": largest, "histogram": histogram, "bin_edges": bin_edges}
+
+    @staticmethod
+    def _check_scenarios(scenarios):
+        """
+        Method that converts the scenarios to a 2D numpy array of floats and raises a ValueError if they do not have
+        3 columns.
+        """
+        scenarios = np.atleast_2d(np.asarray(scenarios, dtype=np.float64))
+        if scenarios.ndim != 2 or scenarios.shape[1] != 3:
+            raise ValueError("Each scenario should be a (base, decay, hub_factor) row of 3 numbers.")
+        return scenarios
+
+    @staticmethod
+    def _histogram(fares, bin_edges):
+        """
+        Method that counts the fares of each scenario (row) falling in each bin, using either edges shared by every
+        scenario (1D array) or separate edges for each scenario (2D array). Like numpy's histogram function, the last
+        bin includes its right edge and fares outside the edges are not counted.
+        """
+        n_scenarios = fares.shape[0]
+        n_bins = bin_edges.shape[-1] - 1
+        if bin_edges.ndim == 1:
+            bin_index = np.searchsorted(bin_edges, fares, side="right") - 1
+            bin_index[fares == bin_edges[-1]] = n_bins - 1
+        else:  # The edges of each scenario are equally spaced so the bin can be worked out directly
+            low = bin_edges[:, :1]
+            width = (bin_edges[:, -1:] - low) / n_bins
+            width[width == 0] = 1  # Scenarios with a single fare value put every fare in the first bin
+            bin_index = np.minimum(np.floor((fares - low) / width).astype(np.int64), n_bins - 1)
+        counted = (bin_index >= 0) & (bin_index < n_bins)
+        # Offsets the bins of each scenario so that a single bincount call counts every scenario at once
+        offsets = np.arange(n_scenarios)[:, None] * n_bins
+        counts = np.bincount((bin_index + offsets)[counted], minlength=n_scenarios * n_bins)
+        return counts.reshape(n_scenarios, n_bins)
+
+
+if __name__ == "__main__":  # Runs the command-line tools, e.g. python -m railway quote --network uk_stations.csv
+    import sys
+    from cli import main
+    sys.exit(main())
@@ -0,0 +1,154 @@
+import json
+import sys
+import threading
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+from railway import NetworkArrays, RailNetwork
+
+# The network arrays attributes that are stored in a snapshot, in the order they are laid out in shared memory
+COLUMNS = ["crs", "names", "region_names", "region_codes", "lat", "lon", "hub", "hubs_per_region", "closest_hub",
+           "crs_sorted", "crs_order"]
+HEADER_SIZE = 8  # Number of bytes at the start of the block holding the length of the JSON layout that follows
+ALIGNMENT = 64  # Each column starts on a multiple of this many bytes
+_register_lock = threading.Lock()
+
+
+def _attach_shared_memory(name):
+    """
+    Function that attaches to the existing shared memory block of the given name without registering it with the
+    resource tracker of this process. Registering it would make the tracker unlink the block (removing it for every
+    other process) when this process exits, as only the process that published the block should do that.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    with _register_lock:  # Older versions always register the block, so registering is switched off while attaching
+        register = resource_tracker.register
+        resource_tracker.register = lambda name, rtype: None
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+class NetworkSnapshot:
+    """
+    A class to represent a read-only copy of the network arrays of a rail network held in a shared memory block, so
+    that many processes can plan and price journeys on the same network without each loading or unpickling it.
+
+    One process publishes the snapshot and the others attach to it by name. Attaching only reads a small layout
+    description and creates numpy arrays that point into the shared memory block, so it takes the same time
+    whatever the size of the network and uses no extra memory per process. Every process calls close once it is done
+    with the snapshot and the publishing process calls unlink once every process is done with it. Both happen
+    automatically when the snapshot is used in a with statement.
+    """
+
+    def __init__(self, block, arrays, owner):
+        """
+        Constructor method that defines all the necessary attributes for snapshot objects created from this class.
+        Use the publish and attach methods to create snapshot objects.
+
+        Sets up the attributes:
+        - block - The shared memory block holding the snapshot. -> multiprocessing.shared_memory.SharedMemory
+        - arrays - Read-only network arrays pointing into the shared memory block. -> NetworkArrays
+        - owner - Whether this snapshot object published the block (and so should unlink it). -> Boolean
+        """
+        self.block = block
+        self.arrays = arrays
+        self.owner = owner
+
+    @property
+    def name(self):
+        """
+        The name other processes use to attach to the snapshot.
+        """
+        return self.block.name
+
+    @classmethod
+    def publish(cls, network, name=None):
+        """
+        Method that takes a rail network (or network arrays) object, copies its network arrays into a new shared
+        memory block and returns the snapshot object that owns the block.
+
+        Optionally takes a name parameter which is the name of the shared memory block. This is by default None
+        meaning a unique name is chosen.
+        """
+        arrays = network.network_arrays() if isinstance(network, RailNetwork) else network
+        layout = {}
+        offset = 0
+        for column in COLUMNS:  # Works out where each column goes in the block after the layout
+            values = np.ascontiguousarray(getattr(arrays, column))
+            offset = -(-offset // ALIGNMENT) * ALIGNMENT  # Rounds the offset up to the alignment
+            layout[column] = {"dtype": values.dtype.str, "shape": list(values.shape), "offset": offset}
+            offset += values.nbytes
+        header = json.dumps(layout).encode("utf-8")
+        start = -(-(HEADER_SIZE + len(header)) // ALIGNMENT) * ALIGNMENT  # Columns start after the layout
+        block = shared_memory.SharedMemory(name=name, create=True, size=max(start + offset, 1))
+        try:
+            block.buf[:HEADER_SIZE] = len(header).to_bytes(HEADER_SIZE, "little")
+            block.buf[HEADER_SIZE:HEADER_SIZE + len(header)] = header
+            for column in COLUMNS:  # Copies each column into its place in the block
+                values = getattr(arrays, column)
+                spec = layout[column]
+                view = np.ndarray(values.shape, dtype=spec["dtype"], buffer=block.buf, offset=start + spec["offset"])
+                view[...] = values
+                del view  # The block cannot be closed while arrays still point into it
+        except BaseException:
+            block.close()
+            block.unlink()
+            raise
+        return cls(block, cls._read_arrays(block), True)
+
+    @classmethod
+    def attach(cls, name):
+        """
+        Method that takes the name of a published snapshot and returns a snapshot object attached to it.
+        """
+        block = _attach_shared_memory(name)
+        try:
+            arrays = cls._read_arrays(block)
+        except BaseException:
+            block.close()
+            raise
+        return cls(block, arrays, False)
+
+    @staticmethod
+    def _read_arrays(block):
+        """
+        Method that reads the layout at the start of a shared memory block and returns read-only network arrays
+        pointing into the block.
+        """
+        header_length = int.from_bytes(bytes(block.buf[:HEADER_SIZE]), "little")
+        layout = json.loads(bytes(block.buf[HEADER_SIZE:HEADER_SIZE + header_length]).decode("utf-8"))
+        start = -(-(HEADER_SIZE + header_length) // ALIGNMENT) * ALIGNMENT
+        columns = {}
+        for column in COLUMNS:
+            spec = layout[column]
+            values = np.ndarray(tuple(spec["shape"]), dtype=spec["dtype"], buffer=block.buf,
+                                offset=start + spec["offset"])
+            values.flags.writeable = False  # Other processes share the block so it must not be changed
+            columns[column] = values
+        return NetworkArrays(**columns)
+
+    def close(self):
+        """
+        Method that detaches this process from the snapshot. The network arrays of the snapshot cannot be used
+        afterwards, and any references to them must be dropped before calling it.
+        """
+        self.arrays = None  # Drops the arrays pointing into the block so that it can be closed
+        self.block.close()
+
+    def unlink(self):
+        """
+        Method that removes the shared memory block of the snapshot, once every process has closed it. Only the
+        process that published the snapshot should call it.
+        """
+        self.block.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        if self.owner:
+            self.unlink()
@@ -1,10 +1,14 @@
 import pytest
-from railway import fare_price, Station, RailNetwork
+from railway import fare_price, Station, RailNetwork, FareModel, render_journeys
 import numpy as np
-from utilities import read_rail_network
+from utilities import read_rail_network, read_rail_network_columns
 from pathlib import Path
 import matplotlib.pyplot as plt
 import warnings
+import multiprocessing
+from snapshot import NetworkSnapshot
+import json
+import cli
 
 
 # Used to store various parameters for Station object creation to carry out similar tests more efficiently
@@ -47,6 +51,24 @@ def test_fare_price():
     # test function
 
 
+def test_fare_price_tariff():
+    """
+    Function to test whether the fare_price function uses the optional tariff constants given as parameters in place
+    of the ones in the formula, and whether it prices arrays of tariff constants element-wise.
+    """
+    distance = 100
+    different_regions = 1
+    hubs_in_dest_region = 3
+    # Calculates the fare price with a different base, decay and hub_factor using the function and the formula
+    result = fare_price(distance, different_regions, hubs_in_dest_region, 2, 50, 5)
+    expected = 2 + distance * np.exp((-1 * distance) / 50) * (1 + (different_regions * hubs_in_dest_region) / 5)
+    assert result == pytest.approx(expected)
+    # Checks that an array of bases gives an array of fare prices, one per base
+    result = fare_price(distance, different_regions, hubs_in_dest_region, base=np.array([1, 2]))
+    expected = fare_price(distance, different_regions, hubs_in_dest_region)
+    assert list(result) == pytest.approx([expected, expected + 1])
+
+
 # Used to store various parameters for Station object creation to carry out similar tests more efficiently
 @pytest.mark.parametrize("name, region, crs, lat, lon, hub",
                          # This has an int value in the name parameter rather than a string
@@ -389,3 +411,301 @@ def test_plot_fares_to_save(csv_network):
     except FileNotFoundError:  # If a FileNotFoundError is raised, the test fails. This would indicate that the plot
         # was either not saved or not saved in the correct format
         assert False, "The method raised a FileNotFoundError."
+
+
+def test_network_arrays_fares(csv_network):
+    """
+    Function to test whether the fares method of the NetworkArrays class calculates the same fare prices as the
+    journey_fare method of the RailNetwork class for journeys of different legs, and gives NaN for a journey that
+    cannot be planned.
+    """
+    rail_network, stations = csv_network  # Gets the rail_network object and list of stations I created in the
+    # csv_network() function
+    arrays = rail_network.network_arrays()
+    starts = arrays.index_of(["BTN", "DBY", "EDP"])
+    dests = arrays.index_of(["LRB", "DPT", "EDG"])
+    result = arrays.fares(starts, dests)
+    expected = [rail_network.journey_fare("BTN", "LRB"), rail_network.journey_fare("DBY", "DPT"),
+                rail_network.journey_fare("EDP", "EDG")]
+    assert list(result) == expected
+    assert list(arrays.index_of(["ZZZ"])) == [-1]  # Unknown CRS codes are given an index of -1
+
+
+def test_fare_model_evaluate(stations):
+    """
+    Function to test whether the evaluate method of the FareModel class prices every journey that can be planned
+    under each scenario and summarises the fares of each scenario correctly.
+
+    Only the journeys between Brighton and King's Cross (both hub stations) can be planned in the example network,
+    as Edinburgh Park has no hub station in its region.
+    """
+    brighton, kings_cross, edinburgh_park = stations  # Gets the station objects I created in the stations() function
+    rail_network = RailNetwork([brighton, kings_cross, edinburgh_park])
+    result = FareModel(rail_network).evaluate([(1, 100, 10), (2, 50, 5)], bins=4)
+    distance = brighton.distance_to(kings_cross)
+    # Both journeys go to a different region with 1 hub station, so have the same fare under each scenario
+    expected = [fare_price(distance, 1, 1), fare_price(distance, 1, 1, 2, 50, 5)]
+    assert result["journeys"] == 2
+    assert result["unplanned"] == 4
+    assert list(result["revenue"]) == pytest.approx([2 * fare for fare in expected])
+    assert list(result["min"]) == pytest.approx(expected)
+    assert list(result["max"]) == pytest.approx(expected)
+    assert result["histogram"].sum(axis=1).tolist() == [2, 2]  # Every fare is counted once per scenario
+
+
+def test_fare_model_scenario_error(stations):
+    """
+    Function to test whether the evaluate method of the FareModel class raises a ValueError when the scenarios do not
+    have 3 tariff constants each.
+    """
+    rail_network = RailNetwork(list(stations))
+    with pytest.raises(ValueError):  # Checks whether this test raises a ValueError
+        FareModel(rail_network).evaluate([(1, 100)])
+
+
+def test_from_columns(stations):
+    """
+    Function to test whether the from_columns method of the RailNetwork class creates a rail network object with the
+    same stations as one created from station objects, and returns no errors when every row is valid.
+    """
+    brighton, kings_cross, edinburgh_park = stations  # Gets the station objects I created in the stations() function
+    list_of_stations = [brighton, kings_cross, edinburgh_park]
+    rail_network, errors = RailNetwork.from_columns([station.name for station in list_of_stations],
+                                                    [station.region for station in list_of_stations],
+                                                    [station.crs for station in list_of_stations],
+                                                    [station.lat for station in list_of_stations],
+                                                    [station.lon for station in list_of_stations],
+                                                    ["1", "1", "0"])  # Hub flags can be given as in station files
+    assert errors == []
+    result = [[station.name, station.region, station.crs, station.lat, station.lon, station.hub]
+              for station in rail_network.stations.values()]
+    expected = [[station.name, station.region, station.crs, station.lat, station.lon, station.hub]
+                for station in list_of_stations]
+    assert result == expected
+
+
+def test_from_columns_errors():
+    """
+    Function to test whether the from_columns method of the RailNetwork class returns every problem found in the
+    rows (rather than only the first one) alongside None in place of the rail network object.
+    """
+    rail_network, errors = RailNetwork.from_columns(["Brighton", 6, "Brighton", "Hove"],  # Name is not a string
+                                                    ["South East"] * 4,
+                                                    ["BTN", "KGX", "Btn", "BTN"],  # Lowercase and duplicated codes
+                                                    [50.8, 51.5, 91.0, 50.8],  # Latitude outside the accepted range
+                                                    [-0.1, -0.1, -0.1, -0.1],
+                                                    [True, True, False, "True!"])  # Hub flag is not valid
+    assert rail_network is None
+    # Checks the row of each error found - row 2 has both a lowercase CRS code and a latitude outside the range
+    assert [row for row, message in errors] == [1, 2, 2, 3, 3]
+
+
+def test_from_columns_length_error():
+    """
+    Function to test whether the from_columns method of the RailNetwork class raises a ValueError when the columns
+    have different numbers of rows.
+    """
+    with pytest.raises(ValueError):  # Checks whether this test raises a ValueError
+        RailNetwork.from_columns(["Brighton"], ["South East"], ["BTN"], [50.8], [-0.1], [True, False])
+
+
+def test_read_rail_network_columns(csv_network):
+    """
+    Function to test whether the read_rail_network_columns function creates a rail network object with the same
+    stations as the read_rail_network function from the uk_stations.csv station data.
+    """
+    rail_network, stations = csv_network  # Gets the rail_network object and list of stations I created in the
+    # csv_network() function
+    result, errors = read_rail_network_columns(Path("uk_stations.csv"))
+    assert errors == []
+    assert [repr(station) for station in result.list_of_stations] == [repr(station) for station in stations]
+    assert result.journey_fare("EDP", "EDG") == rail_network.journey_fare("EDP", "EDG")
+
+
+def snapshot_fare(name):
+    """
+    Function used by the snapshot tests in a separate process, which attaches to the snapshot of the given name and
+    returns the fare between Edinburgh Park and Edinburgh Gateway calculated from it.
+    """
+    snapshot = NetworkSnapshot.attach(name)
+    arrays = snapshot.arrays
+    fare = float(arrays.fares(arrays.index_of(["EDP"]), arrays.index_of(["EDG"]))[0])
+    del arrays  # The snapshot cannot be closed while references to its arrays remain
+    snapshot.close()
+    return fare
+
+
+def test_snapshot_attach(csv_network):
+    """
+    Function to test whether a network snapshot attached to by name holds the same network arrays as the rail network
+    object it was published from, and whether those arrays are read-only.
+    """
+    rail_network, stations = csv_network  # Gets the rail_network object and list of stations I created in the
+    # csv_network() function
+    expected = rail_network.network_arrays()
+    with NetworkSnapshot.publish(rail_network) as published:
+        with NetworkSnapshot.attach(published.name) as attached:
+            result = attached.arrays
+            assert list(result.crs) == list(expected.crs)
+            assert list(result.closest_hub) == list(expected.closest_hub)
+            assert list(result.region_names) == list(expected.region_names)
+            with pytest.raises(ValueError):  # Checks whether writing to the snapshot raises a ValueError
+                result.lat[0] = 0.0
+            del result
+
+
+def test_snapshot_other_process(csv_network):
+    """
+    Function to test whether a network snapshot can be attached to from other processes, giving the same fare as
+    the journey_fare method of the RailNetwork class, and whether it can no longer be attached to once unlinked.
+    """
+    rail_network, stations = csv_network  # Gets the rail_network object and list of stations I created in the
+    # csv_network() function
+    with NetworkSnapshot.publish(rail_network) as published:
+        name = published.name
+        with multiprocessing.Pool(2) as pool:
+            result = pool.map(snapshot_fare, [name] * 2)
+    assert result == [rail_network.journey_fare("EDP", "EDG")] * 2
+    with pytest.raises(FileNotFoundError):  # The with statement has unlinked the snapshot
+        NetworkSnapshot.attach(name)
+
+
+def test_quote(csv_network):
+    """
+    Function to test whether the quote method of the RailNetwork class returns a journey object with the same route
+    as the journey_planner method, a distance and fare price for each leg and the same total as the journey_fare
+    method for a 3 leg journey.
+    """
+    rail_network, stations = csv_network  # Gets the rail_network object and list of stations I created in the
+    # csv_network() function
+    journey = rail_network.quote("EDP", "EDG")
+    assert journey.stations() == rail_network.journey_planner("EDP", "EDG")
+    assert journey.route == (741, 2025, 1300, 739)  # The same stations as in test_journey_planner_three_leg
+    assert len(journey.distances) == len(journey.fares) == 3
+    assert journey.distances[0] == stations[741].distance_to(stations[2025])
+    assert journey.total == rail_network.journey_fare("EDP", "EDG")
+    assert sum(journey.fares) == pytest.approx(journey.total)
+
+
+def test_quote_error(stations):
+    """
+    Function to test whether the quote method of the RailNetwork class raises a ValueError when a journey needs the
+    closest hub station of a station that has no hub stations in its region.
+    """
+    rail_network = RailNetwork(list(stations))  # Creates a RailNetwork object from the example station objects
+    with pytest.raises(ValueError):  # Checks whether this test raises a ValueError
+        rail_network.quote("BTN", "EDP")  # Edinburgh Park has no hub station in its region
+
+
+def test_journey_summary(csv_network, capsys):
+    """
+    Function to test whether the summary of a journey object is the same as the summary printed by the journey_fare
+    method of the RailNetwork class, and whether render_journeys puts the summaries of several journeys together.
+    """
+    rail_network, stations = csv_network  # Gets the rail_network object and list of stations I created in the
+    # csv_network() function
+    rail_network.journey_fare("DBY", "DPT", summary=True)
+    printed = capsys.readouterr().out
+    expected = "Journey from Derby (DBY) to Devonport (DPT)\nRoute: DBY -> EXC (Exeter Central) -> DPT\nFare: \u00a354.98"
+    assert rail_network.quote("DBY", "DPT").summary() == expected
+    assert printed == expected + "\n\n"
+    report = render_journeys([rail_network.quote("DBY", "DPT"), rail_network.quote("BTN", "LRB")])
+    assert report == printed + rail_network.quote("BTN", "LRB").summary() + "\n\n"
+
+
+def test_cli_quote_jsonl(tmp_path, capsys, csv_network):
+    """
+    Function to test whether the quote command prices every JSONL query in a file, giving the same fare as the
+    journey_fare method of the RailNetwork class and an error record (rather than stopping) for each query that
+    cannot be priced.
+    """
+    rail_network, stations = csv_network  # Gets the rail_network object and list of stations I created in the
+    # csv_network() function
+    queries = tmp_path / "queries.jsonl"
+    queries.write_text('{"start": "EDP", "dest": "EDG"}\n{"start": "ZZZ", "dest": "EDG"}\nnot a query\n')
+    exit_code = cli.main(["quote", "--network", "uk_stations.csv", "--input", str(queries), "--batch-size", "2"])
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert exit_code == 0
+    assert records[0] == {"line": 1, "start": "EDP", "dest": "EDG", "fare": rail_network.journey_fare("EDP", "EDG")}
+    assert records[1]["error"] == cli.UNKNOWN_START
+    assert records[2] == {"line": 3, "error": cli.BAD_QUERY}
+
+
+def test_cli_quote_csv_workers(tmp_path, capsys):
+    """
+    Function to test whether the quote command gives the same records for CSV queries when they are priced by several
+    worker processes as when they are priced by one.
+    """
+    queries = tmp_path / "queries.csv"
+    queries.write_text("start,dest\nBTN,LRB\nDBY,DPT\nBTN,EDP\nKGX\n")
+    cli.main(["quote", "--network", "uk_stations.csv", "--input", str(queries)])
+    expected = capsys.readouterr().out
+    cli.main(["quote", "--network", "uk_stations.csv", "--input", str(queries), "--workers", "2", "--batch-size", "1"])
+    result = capsys.readouterr().out
+    assert result == expected
+    assert len(result.splitlines()) == 4  # Every query has a record, including the row missing its dest
+
+
+def snapshot_region_summary(name, origins):
+    """
+    Function used by the region fare summary test in a separate process, which attaches to the snapshot of the given
+    name and returns the region fare summary of the journeys from the given starting stations.
+    """
+    snapshot = NetworkSnapshot.attach(name)
+    summary = snapshot.arrays.region_fare_summary(origins=origins)
+    snapshot.close()
+    return summary
+
+
+def test_region_fare_summary():
+    """
+    Function to test whether the region_fare_summary method of the RailNetwork class gives the count, smallest,
+    mean and largest fare of the journeys between each pair of regions, compared to the fares calculated with the
+    journey_fare method.
+    """
+    list_of_stations = [Station("Brighton", "South East", "BTN", 50.829659, -0.141234, True),
+                        Station("Hove", "South East", "HOV", 50.835156, -0.170776, False),
+                        Station("London Kings Cross", "London", "KGX", 51.530827, -0.122907, True),
+                        Station("London Road (Brighton)", "South East", "LRB", 50.836667, -0.136666, False)]
+    rail_network = RailNetwork(list_of_stations)
+    result = rail_network.region_fare_summary(block_size=1).results(percentiles=(50,))
+    # Every journey from London goes to the South East, as King's Cross is the only station in London
+    fares = [rail_network.journey_fare("KGX", crs) for crs in ["BTN", "HOV", "LRB"]]
+    assert result[("London", "South East")]["count"] == 3
+    assert result[("London", "South East")]["min"] == min(fares)
+    assert result[("London", "South East")]["max"] == max(fares)
+    assert result[("London", "South East")]["mean"] == pytest.approx(sum(fares) / 3)
+    assert min(fares) <= result[("London", "South East")]["p50"] <= max(fares)
+    assert result[("South East", "South East")]["count"] == 6  # 3 stations each travelling to the other 2
+    assert ("London", "London") not in result  # There is no journey from King's Cross to another London station
+
+
+def test_region_fare_summary_merge(csv_network):
+    """
+    Function to test whether the region fare summaries of the journeys from 2 halves of the stations, calculated by
+    separate processes from a network snapshot, merge into the same summary as the one calculated for every station
+    at once.
+    """
+    rail_network, stations = csv_network  # Gets the rail_network object and list of stations I created in the
+    # csv_network() function
+    expected = rail_network.region_fare_summary()
+    every_station = np.arange(rail_network.n_stations())
+    with NetworkSnapshot.publish(rail_network) as published:
+        with multiprocessing.Pool(2) as pool:
+            halves = pool.starmap(snapshot_region_summary, [(published.name, every_station[::2]),
+                                                            (published.name, every_station[1::2])])
+    result = halves[0].merge(halves[1])
+    assert (result.counts == expected.counts).all()
+    assert (result.minimum == expected.minimum).all()
+    assert (result.maximum == expected.maximum).all()
+    assert (result.histogram == expected.histogram).all()
+    assert result.sums == pytest.approx(expected.sums)
+
+
+def test_region_fare_summary_merge_error(stations):
+    """
+    Function to test whether merging region fare summaries with different histogram bin edges raises a ValueError.
+    """
+    rail_network = RailNetwork(list(stations))  # Creates a RailNetwork object from the example station objects
+    with pytest.raises(ValueError):  # Checks whether this test raises a ValueError
+        rail_network.region_fare_summary().merge(rail_network.region_fare_summary(bin_edges=[0, 10, 20]))
@@ -39,3 +39,37 @@ def read_rail_network(filepath):
     return rail_network
 
 
+
+
+def read_rail_network_columns(filepath):
+    """
+    Function that takes a file containing station data in the same format as read_rail_network does, reads the data
+    into columns and checks every row at once using the from_columns method of the RailNetwork class, rather than
+    stopping at the first row that is not a valid station.
+
+    Filepath parameter is a Path file created by Python's pathlib module.
+
+    Returns a tuple of the rail network object created from the file (None if any row is not valid) and a list of
+    (line, message) tuples describing every problem found, where line is the line number of the row in the file
+    (the header being line 1).
+    """
+    with open(filepath, "r", newline="") as stations_file:
+        stations_csv = csv.reader(stations_file)
+        header_info = next(stations_csv)  # The header is always the first row
+        rows = [row for row in stations_csv]
+    # Rows with the wrong number of fields cannot be split into columns so they are reported and left out
+    errors = [(line, "The row should have {} fields but has {}.".format(len(header_info), len(row)))
+              for line, row in enumerate(rows, start=2) if len(row) != len(header_info)]
+    lines = [line for line, row in enumerate(rows, start=2) if len(row) == len(header_info)]
+    columns = list(zip(*[row for row in rows if len(row) == len(header_info)])) or [()] * len(header_info)
+    rail_network, row_errors = RailNetwork.from_columns(columns[header_info.index("name")],
+                                                        columns[header_info.index("region")],
+                                                        columns[header_info.index("crs")],
+                                                        columns[header_info.index("latitude")],
+                                                        columns[header_info.index("longitude")],
+                                                        columns[header_info.index("hub")])
+    errors += [(lines[row], message) for row, message in row_errors]  # Turns the row indexes into line numbers
+    if errors:
+        errors.sort(key=lambda error: error[0])
+        return None, errors
+    return rail_network, []